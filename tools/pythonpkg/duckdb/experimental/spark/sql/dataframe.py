@@ -33,12 +33,13 @@ from .functions import _to_column
 
 
 class DataFrame:
+    __slots__ = ("relation", "session", "_schema")
+
     def __init__(self, relation: duckdb.DuckDBPyRelation, session: "SparkSession"):
         self.relation = relation
         self.session = session
+        # Converted on first access of 'schema', most DataFrames are only passed along to create another one
         self._schema = None
-        if self.relation is not None:
-            self._schema = duckdb_to_spark_schema(self.relation.columns, self.relation.types)
 
     def show(self, **kwargs) -> None:
         self.relation.show()
@@ -605,6 +606,8 @@ class DataFrame:
         StructType([StructField('age', IntegerType(), True),
                     StructField('name', StringType(), True)])
         """
+        if self._schema is None and self.relation is not None:
+            self._schema = duckdb_to_spark_schema(self.relation.columns, self.relation.types)
         return self._schema
 
     @overload
@@ -976,6 +979,25 @@ class DataFrame:
         new_rel = self.relation.project(*projections)
         return DataFrame(new_rel, self.session)
 
+    def _cast_and_rename(self, types, names) -> "DataFrame":
+        # Equivalent to '_cast_types(*types).toDF(*names)', but done in a single projection
+        # 'types' holds DuckDBPyType objects, which are used as-is instead of being parsed again
+        existing_columns = self.relation.columns
+        types_count = len(types)
+        assert types_count == len(existing_columns)
+        column_count = len(names)
+        if column_count != len(existing_columns):
+            raise PySparkValueError(
+                message="Provided column names and number of columns in the DataFrame don't match"
+            )
+
+        projections = [
+            ColumnExpression(existing).cast(target_type).alias(new)
+            for existing, target_type, new in zip(existing_columns, types, names)
+        ]
+        new_rel = self.relation.project(*projections)
+        return DataFrame(new_rel, self.session)
+
     def collect(self) -> List[Row]:
         columns = self.relation.columns
         result = self.relation.fetchall()
@@ -1,20 +1,26 @@
-from typing import Optional, List, Any, Union, Iterable, TYPE_CHECKING
-import uuid
+from __future__ import annotations
+
+from typing import Optional, List, Any, Union, Iterable, Sequence, TYPE_CHECKING
+import datetime
+import functools
+import itertools
+import sys
 
 if TYPE_CHECKING:
     from .catalog import Catalog
     from pandas.core.frame import DataFrame as PandasDataFrame
+    import pyarrow as pa
+    from ..conf import SparkConf
+    from .udf import UDFRegistration
+    from .streaming import DataStreamReader
 
 from ..exception import ContributionsAcceptedError
  
-from .types import StructType, AtomicType, DataType
-from ..conf import SparkConf
+from .types import StructType
 from .dataframe import DataFrame
 from .conf import RuntimeConfig
 from .readwriter import DataFrameReader
 from ..context import SparkContext
-from .udf import UDFRegistration
-from .streaming import DataStreamReader
 import duckdb
 
 from ..errors import (
@@ -38,35 +44,171 @@ from ..errors.error_classes import *
 def _combine_data_and_schema(data: Iterable[Any], schema: StructType):
     from duckdb import Value
 
+    duckdb_types = [y.dataType.duckdb_type for y in schema]
     new_data = []
     for row in data:
-        new_row = [Value(x, dtype.duckdb_type) for x, dtype in zip(row, [y.dataType for y in schema])]
+        new_row = [Value(x, duckdb_type) for x, duckdb_type in zip(row, duckdb_types)]
         new_data.append(new_row)
     return new_data
 
 
+# numpy, pandas and pyarrow are only imported once they're needed, the result is cached after the first call
+# Returns the (numpy, pandas) modules, or None when pandas is not installed
+@functools.lru_cache(maxsize=None)
+def _import_pandas():
+    try:
+        import numpy
+        import pandas
+    except ImportError:
+        return None
+    return numpy, pandas
+
+
+# Returns the pyarrow module, or None when pyarrow is not installed
+@functools.lru_cache(maxsize=None)
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        return None
+    return pyarrow
+
+
+# Data can only be a pandas DataFrame if pandas was already imported, checking that doesn't import it
+def _is_pandas_dataframe(data: Any) -> bool:
+    pandas = sys.modules.get('pandas')
+    return pandas is not None and isinstance(data, pandas.DataFrame)
+
+
+# Suffix for the names of the temporary tables used to load the rows of a DataFrame created from Python data
+_tmp_counter = itertools.count()
+
+# The maximum number of parameters bound by a single INSERT when loading rows into a temporary table
+_INSERT_BATCH_PARAMETERS = 4096
+
+
+# The DuckDB type a Python value of this (exact) type binds as
+_PYTHON_TO_DUCKDB_TYPES = {
+    bool: 'BOOLEAN',
+    int: 'BIGINT',
+    float: 'DOUBLE',
+    str: 'VARCHAR',
+    bytes: 'BLOB',
+    datetime.date: 'DATE',
+    datetime.datetime: 'TIMESTAMP',
+    datetime.time: 'TIME',
+}
+
+
+# Infer the DuckDB type of a column from its Python values
+# Returns None when the column can't be given a single type up front (all NULL, mixed or nested values),
+# those columns are left to the type resolution of a VALUES list instead
+def _infer_column_type(column: Iterable[Any]) -> Optional[str]:
+    from duckdb import Value
+
+    values = [x for x in column if x is not None]
+    if not values:
+        return None
+    python_types = {type(x) for x in values}
+    if all(issubclass(x, Value) for x in python_types):
+        duckdb_types = {str(x.type) for x in values}
+        if len(duckdb_types) != 1:
+            return None
+        return duckdb_types.pop()
+    if len(python_types) != 1:
+        return None
+    python_type = python_types.pop()
+    duckdb_type = _PYTHON_TO_DUCKDB_TYPES.get(python_type)
+    if duckdb_type is None:
+        # Subclasses of the supported types (an IntEnum for example) are bound as their base type
+        python_type = next((x for x in python_type.__mro__ if x in _PYTHON_TO_DUCKDB_TYPES), None)
+        if python_type is None:
+            return None
+        duckdb_type = _PYTHON_TO_DUCKDB_TYPES[python_type]
+    if python_type is int:
+        # Like a bound parameter, use INTEGER when the values fit
+        lowest = min(values)
+        highest = max(values)
+        if -(2**31) <= lowest and highest < 2**31:
+            return 'INTEGER'
+        if -(2**63) <= lowest and highest < 2**63:
+            return duckdb_type
+        return None
+    if python_type in (datetime.datetime, datetime.time):
+        # Values with a timezone would need the WITH TIME ZONE variants
+        if any(x.tzinfo is not None for x in values):
+            return None
+    return duckdb_type
+
+
+# Build a pandas DataFrame backed by a single 2D numpy array when every column has the same numeric type
+# Returns None when pandas is not available or the columns are not homogeneously numeric
+def _create_numpy_dataframe(
+    data: Sequence[Any], columns: List[Any], column_types: List[str]
+) -> Optional[PandasDataFrame]:
+    numpy_types = {
+        'INTEGER': 'int32',
+        'BIGINT': 'int64',
+        'DOUBLE': 'float64',
+    }
+    column_type = column_types[0]
+    if column_type not in numpy_types or any(x != column_type for x in column_types):
+        return None
+    # NULLs can't be represented in a numeric numpy array
+    if any(None in column for column in columns):
+        return None
+    # The numpy scan reads NaN as NULL, while every other path keeps it as NaN
+    if column_type == 'DOUBLE' and any(x != x for column in columns for x in column):
+        return None
+    modules = _import_pandas()
+    if modules is None:
+        return None
+    np, pd = modules
+    # Column-major, so every column is contiguous and the numpy scan can use it without copying element by element
+    array = np.asarray(data, dtype=numpy_types[column_type], order='F')
+    return pd.DataFrame(array, columns=[f'col{i}' for i in range(len(column_types))])
+
+
+# Build an Arrow table out of the (already typed) columns, so it can be scanned without copying
+# Returns None when pyarrow is not available or a column has no direct Arrow equivalent
+def _create_arrow_table(columns: List[Any], column_types: List[str]) -> Optional[pa.Table]:
+    pa = _import_pyarrow()
+    if pa is None:
+        return None
+    arrow_types = {
+        'BOOLEAN': pa.bool_(),
+        'INTEGER': pa.int32(),
+        'BIGINT': pa.int64(),
+        'DOUBLE': pa.float64(),
+        'VARCHAR': pa.string(),
+        'BLOB': pa.binary(),
+        'DATE': pa.date32(),
+        'TIMESTAMP': pa.timestamp('us'),
+        'TIME': pa.time64('us'),
+    }
+    if not all(x in arrow_types for x in column_types):
+        return None
+    arrays = [pa.array(column, type=arrow_types[x]) for column, x in zip(columns, column_types)]
+    return pa.Table.from_arrays(arrays, names=[f'col{i}' for i in range(len(arrays))])
+
+
 class SparkSession:
     def __init__(self, context: SparkContext):
         self.conn = context.connection
         self._context = context
         self._conf = RuntimeConfig(self.conn)
 
-    def _create_dataframe(self, data: Union[Iterable[Any], "PandasDataFrame"]) -> DataFrame:
-        try:
-            import pandas
-            has_pandas = True
-        except ImportError:
-            has_pandas = False
-        if has_pandas and isinstance(data, pandas.DataFrame):
-            unique_name = f'pyspark_pandas_df_{uuid.uuid1()}'
-            self.conn.register(unique_name, data)
-            return DataFrame(self.conn.sql(f'select * from "{unique_name}"'), self)
+    def _create_dataframe(self, data: Union[Iterable[Any], PandasDataFrame]) -> DataFrame:
+        from duckdb import Value
+
+        if _is_pandas_dataframe(data):
+            return DataFrame(self.conn.from_df(data), self)
 
         def verify_tuple_integrity(tuples):
             if len(tuples) <= 1:
                 return
             expected_length = len(tuples[0])
-            for i, item in enumerate(tuples[1:]):
+            for i, item in enumerate(itertools.islice(tuples, 1, None)):
                 actual_length = len(item)
                 if expected_length == actual_length:
                     continue
@@ -80,20 +222,39 @@ class SparkSession:
                     },
                 )
 
-        if not isinstance(data, list):
+        # Everything below only needs len() and indexing, so sequences that already support those aren't copied
+        if not isinstance(data, (list, tuple)):
             data = list(data)
+        if not data:
+            # The relation is the same for every empty input, only plan it once per session
+            if not hasattr(self, "_empty_rel"):
+                self._empty_rel = self.conn.sql('select 42 where 1=0')
+            return DataFrame(self._empty_rel, self)
         verify_tuple_integrity(data)
 
-        def construct_query(tuples) -> str:
-            def construct_values_list(row, start_param_idx):
-                parameter_count = len(row)
-                parameters = [f'${x+start_param_idx}' for x in range(parameter_count)]
-                parameters = '(' + ', '.join(parameters) + ')'
-                return parameters
+        columns = list(zip(*data))
+        column_types = [_infer_column_type(column) for column in columns]
+        if column_types and all(column_types):
+            # Rows combined with a schema hold duckdb.Value objects, neither numpy nor Arrow can convert those
+            # Any non-NULL value of a column can be one, not just the first, so all of them are checked
+            holds_values = any(isinstance(x, Value) for column in columns for x in column)
+            # The relations created by 'from_df' and 'from_arrow' keep the Python object alive themselves,
+            # so it's released together with the DataFrame instead of staying registered on the connection
+            if not holds_values:
+                numpy_df = _create_numpy_dataframe(data, columns, column_types)
+                if numpy_df is not None:
+                    return DataFrame(self.conn.from_df(numpy_df), self)
+                arrow_table = _create_arrow_table(columns, column_types)
+                if arrow_table is not None:
+                    return DataFrame(self.conn.from_arrow(arrow_table), self)
+            # The temporary table is read back as an Arrow table, without pyarrow the VALUES list is used instead
+            if _import_pyarrow() is not None:
+                return self._create_dataframe_from_table(data, column_types)
 
-            row_size = len(tuples[0])
-            values_list = [construct_values_list(x, 1 + (i * row_size)) for i, x in enumerate(tuples)]
-            values_list = ', '.join(values_list)
+        def construct_query(tuples) -> str:
+            # Every row has the same shape, so all rows share the same positional placeholders
+            row_placeholders = '(' + ', '.join(['?'] * len(tuples[0])) + ')'
+            values_list = ', '.join([row_placeholders] * len(tuples))
 
             query = f"""
                 select * from (values {values_list})
@@ -101,32 +262,56 @@ class SparkSession:
             return query
 
         query = construct_query(data)
-
-        def construct_parameters(tuples):
-            parameters = []
-            for row in tuples:
-                parameters.extend(list(row))
-            return parameters
-
-        parameters = construct_parameters(data)
+        parameters = list(itertools.chain.from_iterable(data))
 
         rel = self.conn.sql(query, params=parameters)
         return DataFrame(rel, self)
 
-    def _createDataFrameFromPandas(self, data: "PandasDataFrame", types, names) -> DataFrame:
+    def _create_dataframe_from_table(self, data: Sequence[Any], column_types: List[str]) -> DataFrame:
+        # Load the rows into a temporary table in batches of multi-row INSERTs,
+        # this keeps the size of every query string and its parameter list bounded
+        unique_name = f'pyspark_tmp_{next(_tmp_counter)}'
+        columns = ', '.join(f'col{i} {column_type}' for i, column_type in enumerate(column_types))
+        self.conn.execute(f'create temp table "{unique_name}" ({columns})')
+        try:
+            self._insert_in_batches(unique_name, data, len(column_types))
+            # Read the rows back as columns, the relation over the Arrow table owns its data
+            # so the table doesn't have to outlive this call
+            arrow_table = self.conn.table(unique_name).fetch_arrow_table()
+        finally:
+            self.conn.execute(f'drop table if exists "{unique_name}"')
+        return DataFrame(self.conn.from_arrow(arrow_table), self)
+
+    def _insert_in_batches(self, table_name: str, data: Sequence[Any], row_size: int) -> None:
+        batch_size = max(1, _INSERT_BATCH_PARAMETERS // row_size)
+        row_placeholders = '(' + ', '.join(['?'] * row_size) + ')'
+
+        def construct_insert(row_count) -> str:
+            values_list = ', '.join([row_placeholders] * row_count)
+            return f'insert into "{table_name}" values {values_list}'
+
+        # Only the last batch can be smaller, every other batch reuses the same query string
+        batch_rows = min(batch_size, len(data))
+        batch_query = construct_insert(batch_rows)
+        for start in range(0, len(data), batch_size):
+            batch = data[start : start + batch_size]
+            query = batch_query if len(batch) == batch_rows else construct_insert(len(batch))
+            self.conn.execute(query, list(itertools.chain.from_iterable(batch)))
+
+    def _createDataFrameFromPandas(self, data: PandasDataFrame, types, names) -> DataFrame:
         df = self._create_dataframe(data)
 
-        # Cast to types
+        # Cast to types and alias to names
         if types:
-            df = df._cast_types(*types)
-        # Alias to names
-        if names:
+            # Types only come from a StructType schema, which always provides the names as well
+            df = df._cast_and_rename(types, names)
+        elif names:
             df = df.toDF(*names)
         return df
 
     def createDataFrame(
         self,
-        data: Union["PandasDataFrame", Iterable[Any]],
+        data: Union[PandasDataFrame, Iterable[Any]],
         schema: Optional[Union[StructType, List[str]]] = None,
         samplingRatio: Optional[float] = None,
         verifySchema: bool = True,
@@ -146,19 +331,15 @@ class SparkSession:
 
         if schema:
             if isinstance(schema, StructType):
-                types, names = schema.extract_types_and_names()
+                # The DuckDBPyType objects of the schema are passed on directly, not as type strings
+                types = [f.dataType.duckdb_type for f in schema.fields]
+                names = schema.fieldNames()
             else:
                 names = schema
 
-        try:
-            import pandas
-
-            has_pandas = True
-        except ImportError:
-            has_pandas = False
         # Falsey check on pandas dataframe is not defined, so first check if it's not a pandas dataframe
         # Then check if 'data' is None or []
-        if has_pandas and isinstance(data, pandas.DataFrame):
+        if _is_pandas_dataframe(data):
             return self._createDataFrameFromPandas(data, types, names)
 
         # Finally check if a schema was provided
@@ -179,40 +360,48 @@ class SparkSession:
             rel = rel.filter('1=0')
             df = DataFrame(rel, self)
 
-        # Cast to types
+        # Cast to types and alias to names
         if types:
-            df = df._cast_types(*types)
-        # Alias to names
-        if names:
+            # Types only come from a StructType schema, which always provides the names as well
+            df = df._cast_and_rename(types, names)
+        elif names:
             df = df.toDF(*names)
         return df
 
-    def newSession(self) -> "SparkSession":
+    def newSession(self) -> SparkSession:
         return SparkSession(self._context)
 
     def range(
         self, start: int, end: Optional[int] = None, step: int = 1, numPartitions: Optional[int] = None
-    ) -> "DataFrame":
+    ) -> DataFrame:
         raise ContributionsAcceptedError
 
+    def _sql_relation(self, sqlQuery: str) -> duckdb.DuckDBPyRelation:
+        # Used internally when the result is consumed directly, skips the DataFrame wrapper
+        return self.conn.sql(sqlQuery)
+
     def sql(self, sqlQuery: str, **kwargs: Any) -> DataFrame:
         if kwargs:
             raise NotImplementedError
-        relation = self.conn.sql(sqlQuery)
+        relation = self._sql_relation(sqlQuery)
         return DataFrame(relation, self)
 
     def stop(self) -> None:
         self._context.stop()
 
+    def _table_relation(self, tableName: str) -> duckdb.DuckDBPyRelation:
+        # Used internally when the result is consumed directly, skips the DataFrame wrapper
+        return self.conn.table(tableName)
+
     def table(self, tableName: str) -> DataFrame:
-        relation = self.conn.table(tableName)
+        relation = self._table_relation(tableName)
         return DataFrame(relation, self)
 
-    def getActiveSession(self) -> "SparkSession":
+    def getActiveSession(self) -> SparkSession:
         return self
 
     @property
-    def catalog(self) -> "Catalog":
+    def catalog(self) -> Catalog:
         if not hasattr(self, "_catalog"):
             from duckdb.experimental.spark.sql.catalog import Catalog
 
@@ -225,11 +414,17 @@ class SparkSession:
 
     @property
     def read(self) -> DataFrameReader:
-        return DataFrameReader(self)
+        if not hasattr(self, "_read"):
+            self._read = DataFrameReader(self)
+        return self._read
 
     @property
     def readStream(self) -> DataStreamReader:
-        return DataStreamReader(self)
+        if not hasattr(self, "_readStream"):
+            from duckdb.experimental.spark.sql.streaming import DataStreamReader
+
+            self._readStream = DataStreamReader(self)
+        return self._readStream
 
     @property
     def sparkContext(self) -> SparkContext:
@@ -241,7 +436,11 @@ class SparkSession:
 
     @property
     def udf(self) -> UDFRegistration:
-        return UDFRegistration()
+        if not hasattr(self, "_udf"):
+            from duckdb.experimental.spark.sql.udf import UDFRegistration
+
+            self._udf = UDFRegistration()
+        return self._udf
 
     @property
     def version(self) -> str:
@@ -251,28 +450,28 @@ class SparkSession:
         def __init__(self):
             pass
 
-        def master(self, name: str) -> "SparkSession.Builder":
+        def master(self, name: str) -> SparkSession.Builder:
             # no-op
             return self
 
-        def appName(self, name: str) -> "SparkSession.Builder":
+        def appName(self, name: str) -> SparkSession.Builder:
             # no-op
             return self
 
-        def remote(self, url: str) -> "SparkSession.Builder":
+        def remote(self, url: str) -> SparkSession.Builder:
             # no-op
             return self
 
-        def getOrCreate(self) -> "SparkSession":
+        def getOrCreate(self) -> SparkSession:
             context = SparkContext("__ignored__")
             return SparkSession(context)
 
         def config(
             self, key: Optional[str] = None, value: Optional[Any] = None, conf: Optional[SparkConf] = None
-        ) -> "SparkSession.Builder":
+        ) -> SparkSession.Builder:
             return self
 
-        def enableHiveSupport(self) -> "SparkSession.Builder":
+        def enableHiveSupport(self) -> SparkSession.Builder:
             # no-op
             return self
 
@@ -901,11 +901,9 @@ class StructType(DataType):
         return item in self.names
 
     def extract_types_and_names(self) -> Tuple[List[str], List[str]]:
-        names = []
-        types = []
-        for f in self.fields:
-            types.append(str(f.dataType.duckdb_type))
-            names.append(f.name)
+        types = [str(f.dataType.duckdb_type) for f in self.fields]
+        # 'names' is kept in sync with 'fields', copy it so the caller can't modify it
+        names = list(self.names)
         return (types, names)
 
     def fieldNames(self) -> List[str]:
@@ -16,6 +16,8 @@ from duckdb.experimental.spark.sql.types import (
 )
 from duckdb.experimental.spark.sql.functions import col, struct, when
 import duckdb
+import datetime
+import math
 import re
 
 from duckdb.experimental.spark.errors import PySparkValueError, PySparkTypeError
@@ -147,6 +149,11 @@ class TestDataFrame(object):
         # TODO: assert that the types and column names are correct
         assert res == []
 
+        # Without a schema
+        df = spark.createDataFrame([])
+        assert df.collect() == []
+        assert spark.createDataFrame(iter([])).collect() == []
+
     def test_df_from_pandas(self, spark):
         import pandas as pd
 
@@ -160,11 +167,139 @@ class TestDataFrame(object):
         res = df.collect()
         assert res == [Row(a=42, b=True), Row(a=21, b=False)]
 
+        # The temporary table used to load the rows doesn't outlive 'createDataFrame'
+        tmp_tables = spark.sql("select table_name from duckdb_tables() where starts_with(table_name, 'pyspark_tmp_')")
+        assert tmp_tables.collect() == []
+        assert df.collect() == res
+
+    def test_df_from_struct_type_multiple_batches(self, spark):
+        from duckdb.experimental.spark.sql.session import _INSERT_BATCH_PARAMETERS
+
+        schema = StructType([StructField('a', LongType()), StructField('b', StringType())])
+        batch_rows = _INSERT_BATCH_PARAMETERS // len(schema.fields)
+        # Two full batches, followed by a shorter one
+        row_count = batch_rows * 2 + batch_rows // 3
+        assert row_count % batch_rows != 0
+
+        data = [(i, str(i)) for i in range(row_count)]
+        df = spark.createDataFrame(data, schema)
+        assert df.count() == row_count
+        res = df.collect()
+        assert res[0] == Row(a=0, b='0')
+        assert res[-1] == Row(a=row_count - 1, b=str(row_count - 1))
+
     def test_df_from_name_list(self, spark):
         df = spark.createDataFrame([(42, True), (21, False)], ['a', 'b'])
         res = df.collect()
         assert res == [Row(a=42, b=True), Row(a=21, b=False)]
 
+    def test_df_from_large_list_of_tuples(self, spark):
+        data = [(i, str(i), i / 2) for i in range(10_000)]
+        df = spark.createDataFrame(data, ['a', 'b', 'c'])
+        assert df.count() == 10_000
+        assert df.schema['a'].dataType.typeName() == 'integer'
+        res = df.collect()
+        assert res[0] == Row(a=0, b='0', c=0.0)
+        assert res[-1] == Row(a=9999, b='9999', c=4999.5)
+
+        # Integers that don't fit in an INTEGER
+        df = spark.createDataFrame([(1,), (2**40,)], ['a'])
+        assert df.schema['a'].dataType.typeName() == 'long'
+        assert df.collect() == [Row(a=1), Row(a=2**40)]
+
+    def test_df_from_list_of_tuples_numeric_columns(self, spark):
+        # Homogeneous numeric columns
+        df = spark.createDataFrame([(1, 2), (3, 4)], ['a', 'b'])
+        assert [x.dataType.typeName() for x in df.schema.fields] == ['integer', 'integer']
+        assert df.collect() == [Row(a=1, b=2), Row(a=3, b=4)]
+
+        df = spark.createDataFrame([(1, 2**40), (3, 4)], ['a', 'b'])
+        assert [x.dataType.typeName() for x in df.schema.fields] == ['long', 'long']
+        assert df.collect() == [Row(a=1, b=2**40), Row(a=3, b=4)]
+
+        df = spark.createDataFrame([(0.5, 1.5), (2.5, 3.5)], ['a', 'b'])
+        assert [x.dataType.typeName() for x in df.schema.fields] == ['double', 'double']
+        assert df.collect() == [Row(a=0.5, b=1.5), Row(a=2.5, b=3.5)]
+
+        # Every column of the backing array is contiguous, so it's scanned without an element-wise copy
+        from duckdb.experimental.spark.sql.session import _create_numpy_dataframe
+
+        data = [(i, i * 2, i * 3) for i in range(1000)]
+        numpy_df = _create_numpy_dataframe(data, list(zip(*data)), ['BIGINT'] * 3)
+        for name in numpy_df.columns:
+            assert numpy_df[name].to_numpy().strides == (8,)
+        df = spark.createDataFrame(data, ['a', 'b', 'c'])
+        assert df.count() == 1000
+        assert df.collect()[-1] == Row(a=999, b=1998, c=2997)
+
+        # NaN is kept as NaN, not turned into NULL
+        df = spark.createDataFrame([(1.0, float('nan'))], ['a', 'b'])
+        res = df.collect()
+        assert res[0].a == 1.0
+        assert res[0].b is not None and math.isnan(res[0].b)
+
+    def test_df_from_list_of_tuples_temporal_and_binary_columns(self, spark):
+        data = [
+            (b'\x00\x01', datetime.date(2000, 1, 2), datetime.time(12, 30, 15), datetime.datetime(2000, 1, 2, 12, 30)),
+            (b'abc', datetime.date(1999, 12, 31), datetime.time(0, 0, 1, 250), datetime.datetime(1999, 12, 31, 23, 59)),
+        ]
+        df = spark.createDataFrame(data, ['a', 'b', 'c', 'd'])
+        assert [x.dataType.typeName() for x in df.schema.fields] == ['binary', 'date', 'time', 'timestamp']
+        assert df.collect() == [
+            Row(
+                a=b'\x00\x01',
+                b=datetime.date(2000, 1, 2),
+                c=datetime.time(12, 30, 15),
+                d=datetime.datetime(2000, 1, 2, 12, 30),
+            ),
+            Row(
+                a=b'abc',
+                b=datetime.date(1999, 12, 31),
+                c=datetime.time(0, 0, 1, 250),
+                d=datetime.datetime(1999, 12, 31, 23, 59),
+            ),
+        ]
+
+    def test_df_from_list_of_tuples_subclassed_values(self, spark):
+        import enum
+        import pandas as pd
+
+        class Level(enum.IntEnum):
+            LOW = 1
+            HIGH = 2
+
+        class Price(float):
+            pass
+
+        # Values of a subclass of a supported type are typed as that base type
+        data = [
+            (Level.LOW, Price(1.5), pd.Timestamp('2000-01-02 03:04:05')),
+            (Level.HIGH, Price(2.5), pd.Timestamp('2000-01-03')),
+        ]
+        df = spark.createDataFrame(data, ['a', 'b', 'c'])
+        assert [x.dataType.typeName() for x in df.schema.fields] == ['integer', 'double', 'timestamp']
+        assert df.collect() == [
+            Row(a=1, b=1.5, c=datetime.datetime(2000, 1, 2, 3, 4, 5)),
+            Row(a=2, b=2.5, c=datetime.datetime(2000, 1, 3)),
+        ]
+
+        # Only numeric columns
+        df = spark.createDataFrame([(Level.LOW, Level.HIGH), (Level.HIGH, Level.LOW)], ['a', 'b'])
+        assert [x.dataType.typeName() for x in df.schema.fields] == ['integer', 'integer']
+        assert df.collect() == [Row(a=1, b=2), Row(a=2, b=1)]
+
+    def test_df_from_list_of_tuples_with_duckdb_values(self, spark):
+        # A column is typed by its duckdb.Value objects, even when the first value is NULL
+        df = spark.createDataFrame([(None,), (duckdb.Value(1, IntegerType().duckdb_type),)], ['a'])
+        assert df.schema['a'].dataType.typeName() == 'integer'
+        assert df.collect() == [Row(a=None), Row(a=1)]
+
+    def test_df_from_list_of_tuples_untyped_columns(self, spark):
+        # NULL-only and mixed columns can't be typed up front
+        df = spark.createDataFrame([(None, 1, 'a'), (None, 2.5, 'b')], ['a', 'b', 'c'])
+        res = df.collect()
+        assert res == [Row(a=None, b=1.0, c='a'), Row(a=None, b=2.5, c='b')]
+
     def test_df_creation_coverage(self, spark):
         from duckdb.experimental.spark.sql.types import StructType, StructField, StringType, IntegerType
 
@@ -324,3 +324,22 @@ class TestDataFrameJoin(object):
             Row(emp_id=5, name='Brown', superior_emp_id=2, superior_emp_name='Rose'),
             Row(emp_id=6, name='Brown', superior_emp_id=2, superior_emp_name='Rose'),
         ]
+
+    def test_join_created_dataframes(self, spark):
+        import pandas as pd
+
+        # Each of these takes a different path through 'createDataFrame'
+        numeric = spark.createDataFrame([(1, 10), (2, 20)], ['a', 'b'])
+        mixed = spark.createDataFrame([(1, 'one'), (2, 'two')], ['c', 'd'])
+        pandas = spark.createDataFrame(pd.DataFrame({'e': [1, 2], 'f': [True, False]}))
+        other_numeric = spark.createDataFrame([(1, 100), (2, 200)], ['g', 'h'])
+
+        df = numeric.join(mixed, numeric.a == mixed.c, "inner")
+        df = df.join(pandas, df.a == pandas.e, "inner")
+        df = df.join(other_numeric, df.a == other_numeric.g, "inner")
+        df = df.orderBy('a')
+        res = df.collect()
+        assert res == [
+            Row(a=1, b=10, c=1, d='one', e=1, f=True, g=1, h=100),
+            Row(a=2, b=20, c=2, d='two', e=2, f=False, g=2, h=200),
+        ]
@@ -31,45 +31,65 @@ import duckdb
 import pytest
 
 
-class DuckDBTypeTests(unittest.TestCase):
+class SharedTableTestCase(unittest.TestCase):
+    # Creates the table of '_CREATE_SQL' once per class, on a connection shared by all of its tests
+    _CREATE_SQL = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.con = duckdb.connect(":memory:")
+        cls.cur = cls.con.cursor()
+        cls.cur.execute(cls._CREATE_SQL)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cur.close()
+        cls.con.close()
+
     def setUp(self):
-        self.con = duckdb.connect(":memory:")
-        self.cur = self.con.cursor()
-        self.cur.execute("create table test(i bigint, s varchar, f double, b BLOB)")
+        # Every test runs in its own transaction, rolling it back resets the table
+        self.cur.begin()
 
     def tearDown(self):
-        self.cur.close()
-        self.con.close()
+        self.cur.rollback()
+
+
+class DuckDBTypeTests(SharedTableTestCase):
+    _CREATE_SQL = "create table test(i bigint, s varchar, f double, b BLOB)"
+    _INSERT_I = "insert into test(i) values (?)"
+    _INSERT_S = "insert into test(s) values (?)"
+    _INSERT_F = "insert into test(f) values (?)"
+    _INSERT_B = "insert into test(b) values (?)"
 
     def test_CheckString(self):
-        self.cur.execute("insert into test(s) values (?)", (u"Österreich",))
+        self.cur.execute(self._INSERT_S, (u"Österreich",))
         self.cur.execute("select s from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], u"Österreich")
 
     def test_CheckSmallInt(self):
-        self.cur.execute("insert into test(i) values (?)", (42,))
+        self.cur.execute(self._INSERT_I, (42,))
         self.cur.execute("select i from test")
-        row = self.cur.fetchone()
-        self.assertEqual(row[0], 42)
+        res = self.cur.fetchnumpy()
+        self.assertEqual(res['i'][0], 42)
 
     def test_CheckLargeInt(self):
         num = 2**40
-        self.cur.execute("insert into test(i) values (?)", (num,))
+        self.cur.execute(self._INSERT_I, (num,))
         self.cur.execute("select i from test")
-        row = self.cur.fetchone()
-        self.assertEqual(row[0], num)
+        res = self.cur.fetchnumpy()
+        self.assertEqual(res['i'][0], num)
 
     def test_CheckFloat(self):
         val = 3.14
-        self.cur.execute("insert into test(f) values (?)", (val,))
+        self.cur.execute(self._INSERT_F, (val,))
         self.cur.execute("select f from test")
-        row = self.cur.fetchone()
-        self.assertEqual(row[0], val)
+        res = self.cur.fetchnumpy()
+        self.assertEqual(res['f'][0], val)
 
     def test_CheckDecimalTooBig(self):
         val = 17.29
-        self.cur.execute("insert into test(f) values (?)", (decimal.Decimal(val),))
+        self.cur.execute(self._INSERT_F, (decimal.Decimal(val),))
         self.cur.execute("select f from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], val)
@@ -77,7 +97,7 @@ class DuckDBTypeTests(unittest.TestCase):
     def test_CheckDecimal(self):
         val = '17.29'
         val = decimal.Decimal(val)
-        self.cur.execute("insert into test(f) values (?)", (val,))
+        self.cur.execute(self._INSERT_F, (val,))
         self.cur.execute("select f from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], self.cur.execute("select 17.29::DOUBLE").fetchone()[0])
@@ -85,7 +105,7 @@ class DuckDBTypeTests(unittest.TestCase):
     def test_CheckDecimalWithExponent(self):
         val = '1E5'
         val = decimal.Decimal(val)
-        self.cur.execute("insert into test(f) values (?)", (val,))
+        self.cur.execute(self._INSERT_F, (val,))
         self.cur.execute("select f from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], self.cur.execute("select 1.00000::DOUBLE").fetchone()[0])
@@ -94,21 +114,21 @@ class DuckDBTypeTests(unittest.TestCase):
         import math
 
         val = decimal.Decimal('nan')
-        self.cur.execute("insert into test(f) values (?)", (val,))
+        self.cur.execute(self._INSERT_F, (val,))
         self.cur.execute("select f from test")
         row = self.cur.fetchone()
         self.assertEqual(math.isnan(row[0]), True)
 
     def test_CheckInf(self):
         val = decimal.Decimal('inf')
-        self.cur.execute("insert into test(f) values (?)", (val,))
+        self.cur.execute(self._INSERT_F, (val,))
         self.cur.execute("select f from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], val)
 
     def test_CheckBytesBlob(self):
         val = b"Guglhupf"
-        self.cur.execute("insert into test(b) values (?)", (val,))
+        self.cur.execute(self._INSERT_B, (val,))
         self.cur.execute("select b from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], val)
@@ -116,7 +136,7 @@ class DuckDBTypeTests(unittest.TestCase):
     def test_CheckMemoryviewBlob(self):
         sample = b"Guglhupf"
         val = memoryview(sample)
-        self.cur.execute("insert into test(b) values (?)", (val,))
+        self.cur.execute(self._INSERT_B, (val,))
         self.cur.execute("select b from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], sample)
@@ -124,14 +144,14 @@ class DuckDBTypeTests(unittest.TestCase):
     def test_CheckMemoryviewFromhexBlob(self):
         sample = bytes.fromhex('00FF0F2E3D4C5B6A798800FF00')
         val = memoryview(sample)
-        self.cur.execute("insert into test(b) values (?)", (val,))
+        self.cur.execute(self._INSERT_B, (val,))
         self.cur.execute("select b from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], sample)
 
     def test_CheckNoneBlob(self):
         val = None
-        self.cur.execute("insert into test(b) values (?)", (val,))
+        self.cur.execute(self._INSERT_B, (val,))
         self.cur.execute("select b from test")
         row = self.cur.fetchone()
         self.assertEqual(row[0], val)
@@ -142,15 +162,8 @@ class DuckDBTypeTests(unittest.TestCase):
         self.assertEqual(row[0], u"Österreich")
 
 
-class CommonTableExpressionTests(unittest.TestCase):
-    def setUp(self):
-        self.con = duckdb.connect(":memory:")
-        self.cur = self.con.cursor()
-        self.cur.execute("create table test(x int)")
-
-    def tearDown(self):
-        self.cur.close()
-        self.con.close()
+class CommonTableExpressionTests(SharedTableTestCase):
+    _CREATE_SQL = "create table test(x int)"
 
     def test_CheckCursorDescriptionCTESimple(self):
         self.cur.execute("with one as (select 1) select * from one")
@@ -158,49 +171,47 @@ class CommonTableExpressionTests(unittest.TestCase):
         self.assertEqual(self.cur.description[0][0], "1")
 
     def test_CheckCursorDescriptionCTESMultipleColumns(self):
-        self.cur.execute("insert into test values(1)")
-        self.cur.execute("insert into test values(2)")
+        self.cur.executemany("insert into test values(?)", [(1,), (2,)])
         self.cur.execute("with testCTE as (select * from test) select * from testCTE")
         self.assertIsNotNone(self.cur.description)
         self.assertEqual(self.cur.description[0][0], "x")
 
     def test_CheckCursorDescriptionCTE(self):
         self.cur.execute("insert into test values (1)")
-        self.cur.execute("with bar as (select * from test) select * from test where x = 1")
+        self.cur.execute("with bar as (select * from test) select x from test where x in (1, 2) order by x")
         self.assertIsNotNone(self.cur.description)
         self.assertEqual(self.cur.description[0][0], "x")
-        self.cur.execute("with bar as (select * from test) select * from test where x = 2")
+        self.assertEqual(self.cur.fetchall(), [(1,)])
+        # The description is also set when the query returns no rows
+        self.cur.execute("with bar as (select * from test) select x from test where x in (2, 3)")
         self.assertIsNotNone(self.cur.description)
         self.assertEqual(self.cur.description[0][0], "x")
+        self.assertEqual(self.cur.fetchall(), [])
 
 
-class DateTimeTests(unittest.TestCase):
-    def setUp(self):
-        self.con = duckdb.connect(":memory:")
-        self.cur = self.con.cursor()
-        self.cur.execute("create table test(d date, t time, ts timestamp)")
-
-    def tearDown(self):
-        self.cur.close()
-        self.con.close()
+class DateTimeTests(SharedTableTestCase):
+    _CREATE_SQL = "create table test(d date, t time, ts timestamp)"
+    _INSERT_D = "insert into test(d) values (?)"
+    _INSERT_T = "insert into test(t) values (?)"
+    _INSERT_TS = "insert into test(ts) values (?)"
 
     def test_CheckDate(self):
         d = datetime.date(2004, 2, 14)
-        self.cur.execute("insert into test(d) values (?)", (d,))
+        self.cur.execute(self._INSERT_D, (d,))
         self.cur.execute("select d from test")
         d2 = self.cur.fetchone()[0]
         self.assertEqual(d, d2)
 
     def test_CheckTime(self):
         t = datetime.time(7, 15, 0)
-        self.cur.execute("insert into test(t) values (?)", (t,))
+        self.cur.execute(self._INSERT_T, (t,))
         self.cur.execute("select t from test")
         t2 = self.cur.fetchone()[0]
         self.assertEqual(t, t2)
 
     def test_CheckTimestamp(self):
         ts = datetime.datetime(2004, 2, 14, 7, 15, 0)
-        self.cur.execute("insert into test(ts) values (?)", (ts,))
+        self.cur.execute(self._INSERT_TS, (ts,))
         self.cur.execute("select ts from test")
         ts2 = self.cur.fetchone()[0]
         self.assertEqual(ts, ts2)
@@ -215,36 +226,29 @@ class DateTimeTests(unittest.TestCase):
 
     def test_CheckDateTimeSubSeconds(self):
         ts = datetime.datetime(2004, 2, 14, 7, 15, 0, 500000)
-        self.cur.execute("insert into test(ts) values (?)", (ts,))
+        self.cur.execute(self._INSERT_TS, (ts,))
         self.cur.execute("select ts from test")
         ts2 = self.cur.fetchone()[0]
         self.assertEqual(ts, ts2)
 
     def test_CheckTimeSubSeconds(self):
         t = datetime.time(7, 15, 0, 500000)
-        self.cur.execute("insert into test(t) values (?)", (t,))
+        self.cur.execute(self._INSERT_T, (t,))
         self.cur.execute("select t from test")
         t2 = self.cur.fetchone()[0]
         self.assertEqual(t, t2)
 
     def test_CheckDateTimeSubSecondsFloatingPoint(self):
         ts = datetime.datetime(2004, 2, 14, 7, 15, 0, 510241)
-        self.cur.execute("insert into test(ts) values (?)", (ts,))
+        self.cur.execute(self._INSERT_TS, (ts,))
         self.cur.execute("select ts from test")
         ts2 = self.cur.fetchone()[0]
         self.assertEqual(ts.year, ts2.year)
         self.assertEqual(ts2.microsecond, 510241)
 
 
-class ListTests(unittest.TestCase):
-    def setUp(self):
-        self.con = duckdb.connect(":memory:")
-        self.cur = self.con.cursor()
-        self.cur.execute("create table test(single INTEGER[], nested INTEGER[][])")
-
-    def tearDown(self):
-        self.cur.close()
-        self.con.close()
+class ListTests(SharedTableTestCase):
+    _CREATE_SQL = "create table test(single INTEGER[], nested INTEGER[][])"
 
     def test_CheckEmptyList(self):
         val = []